@@ -3,7 +3,12 @@
 Phase Tracker for AI Coding Factory
 
 Tracks the current SDLC phase and enforces gate transitions.
-State is persisted in .factory/state/project-state.json
+State is persisted in .factory/state/project-state.json, with the full
+transition history appended to .factory/state/history.jsonl
+
+Set FACTORY_STATE_FORMAT=msgpack (or pass --state-format msgpack) to store
+the state as .factory/state/project-state.msgpack instead; this requires the
+msgpack package.
 
 Usage:
     python3 scripts/phase-tracker.py status          # Show current phase
@@ -11,23 +16,48 @@ Usage:
     python3 scripts/phase-tracker.py check-gate      # Check if current gate passes
     python3 scripts/phase-tracker.py history         # Show phase transition history
     python3 scripts/phase-tracker.py init [PHASE]    # Initialize tracking (default: ideation)
+    python3 scripts/phase-tracker.py --state-format msgpack status
 """
 
-import argparse
-import json
 import os
+import re
 import sys
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# orjson is optional; fall back to the stdlib encoder when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Find project root
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 STATE_DIR = PROJECT_ROOT / ".factory" / "state"
 STATE_FILE = STATE_DIR / "project-state.json"
+MSGPACK_STATE_FILE = STATE_DIR / "project-state.msgpack"
+HISTORY_LOG = STATE_DIR / "history.jsonl"
 ORCHESTRATOR_FILE = PROJECT_ROOT / ".claude" / "agents" / "orchestrator.yaml"
 
+# State file format: "json" (human-readable, default) or "msgpack" (compact
+# binary). --state-format overrides the environment variable.
+STATE_FORMATS = ("json", "msgpack")
+STATE_FORMAT = os.environ.get("FACTORY_STATE_FORMAT", "json")
+
+# Only the most recent transitions are kept in the state file; the full
+# history lives in the append-only HISTORY_LOG
+HISTORY_LIMIT = 32
+
+# Checklists smaller than this are read directly; mmap setup costs more
+MMAP_MIN_SIZE = 4096
+
+# Matches a checklist box and captures its state: x/X (checked) or space
+CHECKBOX_RE = re.compile(rb'\[([xX ])\]')
+
 # ANSI colors
 class Colors:
     RED = '\033[0;31m'
@@ -39,84 +69,188 @@ class Colors:
     NC = '\033[0m'
 
 
+@dataclass(frozen=True, slots=True)
+class PhaseSpec:
+    """Definition of a single SDLC phase."""
+    description: str
+    next: str
+    gate: Optional[str]
+    required_artifacts: Tuple[str, ...]
+    allowed_actions: Tuple[str, ...]
+    forbidden_actions: Tuple[str, ...]
+
+
 # Phase definitions (from orchestrator.yaml)
-PHASES = {
-    "ideation": {
-        "description": "Define scope and constraints",
-        "next": "development",
-        "gate": "gate_1_ideation_complete",
-        "required_artifacts": [
+PHASES: Dict[str, PhaseSpec] = {
+    "ideation": PhaseSpec(
+        description="Define scope and constraints",
+        next="development",
+        gate="gate_1_ideation_complete",
+        required_artifacts=(
             "requirements.md",
             "epics.md OR user-stories.md",
             "architecture.md",
             "risk-log.md"
-        ],
-        "allowed_actions": ["requirements_gathering", "architecture_design", "risk_assessment"],
-        "forbidden_actions": ["code_changes"]
-    },
-    "development": {
-        "description": "Implement approved stories",
-        "next": "validation",
-        "gate": "gate_3_implementation_complete",
-        "required_artifacts": [
+        ),
+        allowed_actions=("requirements_gathering", "architecture_design", "risk_assessment"),
+        forbidden_actions=("code_changes",)
+    ),
+    "development": PhaseSpec(
+        description="Implement approved stories",
+        next="validation",
+        gate="gate_3_implementation_complete",
+        required_artifacts=(
             "story files (ACF-###.md)",
             "implementation code",
             "tests",
             "documentation updates"
-        ],
-        "allowed_actions": ["implement_stories", "write_tests", "update_docs"],
-        "forbidden_actions": ["unreviewed_dependencies", "untracked_changes"]
-    },
-    "validation": {
-        "description": "Run validation and quality checks",
-        "next": "release",
-        "gate": "gate_5_security_approved",
-        "required_artifacts": [
+        ),
+        allowed_actions=("implement_stories", "write_tests", "update_docs"),
+        forbidden_actions=("unreviewed_dependencies", "untracked_changes")
+    ),
+    "validation": PhaseSpec(
+        description="Run validation and quality checks",
+        next="release",
+        gate="gate_5_security_approved",
+        required_artifacts=(
             "test_report.xml",
             "coverage_report.xml",
             "traceability_report.md"
-        ],
-        "allowed_actions": ["run_validation_scripts", "run_ci_checks"],
-        "forbidden_actions": ["disable_tests", "lower_coverage"]
-    },
-    "release": {
-        "description": "Package and release",
-        "next": "maintenance",
-        "gate": "gate_6_release_ready",
-        "required_artifacts": [
+        ),
+        allowed_actions=("run_validation_scripts", "run_ci_checks"),
+        forbidden_actions=("disable_tests", "lower_coverage")
+    ),
+    "release": PhaseSpec(
+        description="Package and release",
+        next="maintenance",
+        gate="gate_6_release_ready",
+        required_artifacts=(
             "release_notes.md",
             "security_review_checklist.md",
             "release_readiness_checklist.md"
-        ],
-        "allowed_actions": ["package", "release"],
-        "forbidden_actions": ["release_with_violations"]
-    },
-    "maintenance": {
-        "description": "Operate and fix issues",
-        "next": "ideation",  # Cycles back for new features
-        "gate": None,
-        "required_artifacts": [],
-        "allowed_actions": ["operate", "fix_issues", "monitor"],
-        "forbidden_actions": ["silent_hotfixes", "untracked_changes"]
-    }
+        ),
+        allowed_actions=("package", "release"),
+        forbidden_actions=("release_with_violations",)
+    ),
+    "maintenance": PhaseSpec(
+        description="Operate and fix issues",
+        next="ideation",  # Cycles back for new features
+        gate=None,
+        required_artifacts=(),
+        allowed_actions=("operate", "fix_issues", "monitor"),
+        forbidden_actions=("silent_hotfixes", "untracked_changes")
+    )
 }
 
 
+def decode_json(content: bytes):
+    """Decode a JSON document from bytes."""
+    if orjson is not None:
+        return orjson.loads(content)
+
+    import json
+    return json.loads(content)
+
+
+def encode_json_line(value) -> bytes:
+    """Encode a value as a single JSON Lines row."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE, default=str)
+
+    import json
+    return (json.dumps(value, default=str) + '\n').encode()
+
+
+def import_msgpack():
+    """Import msgpack, exiting with an install hint when it is missing."""
+    try:
+        import msgpack
+    except ImportError:
+        print(f"{Colors.RED}ERROR:{Colors.NC} msgpack not installed. Run: pip install msgpack")
+        sys.exit(1)
+    return msgpack
+
+
+def get_state_file() -> Path:
+    """Return the state file for the configured state format."""
+    return MSGPACK_STATE_FILE if STATE_FORMAT == "msgpack" else STATE_FILE
+
+
 def load_state() -> Dict:
     """Load current project state."""
-    if not STATE_FILE.exists():
-        return None
+    state_file = get_state_file()
+    if not state_file.exists():
+        # Read a state saved in the other format, so switching formats works
+        state_file = STATE_FILE if state_file == MSGPACK_STATE_FILE else MSGPACK_STATE_FILE
+        if not state_file.exists():
+            return None
 
-    with open(STATE_FILE, 'r') as f:
-        return json.load(f)
+    content = state_file.read_bytes()
+    if state_file == MSGPACK_STATE_FILE:
+        return import_msgpack().unpackb(content)
+    return decode_json(content)
 
 
 def save_state(state: Dict) -> None:
     """Save project state."""
     STATE_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2, default=str)
+    if STATE_FORMAT == "msgpack":
+        MSGPACK_STATE_FILE.write_bytes(import_msgpack().packb(state, default=str))
+        stale_file = STATE_FILE
+    elif orjson is not None:
+        STATE_FILE.write_bytes(orjson.dumps(
+            state,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+            default=str
+        ))
+        stale_file = MSGPACK_STATE_FILE
+    else:
+        import json
+
+        # Encode up front so the file is written in one call, not per chunk
+        STATE_FILE.write_text(json.dumps(state, indent=2, default=str) + '\n')
+        stale_file = MSGPACK_STATE_FILE
+
+    # Keep a single state file so a format switch can't leave a stale copy
+    stale_file.unlink(missing_ok=True)
+
+
+def append_history(state: Dict, entry: Dict) -> List[Dict]:
+    """
+    Add an entry to the bounded state history.
+
+    Returns:
+        Entries to write to HISTORY_LOG once the state has been saved
+    """
+    history = state.setdefault("history", [])
+    pending = [entry]
+    if not HISTORY_LOG.exists():
+        # Seed the log with entries recorded before it existed
+        pending = history + pending
+
+    history.append(entry)
+    del history[:-HISTORY_LIMIT]
+    return pending
+
+
+def write_history_log(entries: List[Dict], reset: bool = False) -> None:
+    """Append entries to HISTORY_LOG, or replace its contents if reset."""
+    rows = b"".join(encode_json_line(entry) for entry in entries)
+    with open(HISTORY_LOG, 'wb' if reset else 'ab') as f:
+        f.write(rows)
+
+
+def iter_history(state: Dict):
+    """Yield the full history, streaming it from the log when present."""
+    if not HISTORY_LOG.exists():
+        yield from state.get("history", [])
+        return
+
+    with open(HISTORY_LOG, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield decode_json(line)
 
 
 def init_state(phase: str = "ideation") -> Dict:
@@ -126,24 +260,28 @@ def init_state(phase: str = "ideation") -> Dict:
         print(f"Valid phases: {', '.join(PHASES.keys())}")
         sys.exit(1)
 
+    now = datetime.now().isoformat()
     state = {
         "phase": phase,
-        "entered_at": datetime.now().isoformat(),
+        "entered_at": now,
         "project_name": PROJECT_ROOT.name,
         "gate_checks": {},
         "history": [
             {
                 "phase": phase,
-                "entered_at": datetime.now().isoformat(),
+                "entered_at": now,
                 "action": "initialized"
             }
         ]
     }
 
     save_state(state)
+
+    # A fresh state starts a fresh history log; only touch it once saved
+    write_history_log(state["history"], reset=True)
     print(f"{Colors.GREEN}✓{Colors.NC} Initialized project tracking")
     print(f"  Phase: {Colors.CYAN}{phase}{Colors.NC}")
-    print(f"  State file: {STATE_FILE}")
+    print(f"  State file: {get_state_file()}")
 
     return state
 
@@ -158,29 +296,40 @@ def show_status(state: Dict) -> None:
     phase = state["phase"]
     phase_info = PHASES[phase]
 
-    print(f"\n{Colors.BOLD}AI Coding Factory - Phase Status{Colors.NC}")
-    print("=" * 50)
-    print(f"Project:     {state.get('project_name', 'Unknown')}")
-    print(f"Phase:       {Colors.CYAN}{phase}{Colors.NC}")
-    print(f"Description: {phase_info['description']}")
-    print(f"Entered:     {state['entered_at']}")
-    print(f"Next phase:  {phase_info['next']}")
+    lines = [
+        f"\n{Colors.BOLD}AI Coding Factory - Phase Status{Colors.NC}",
+        "=" * 50,
+        f"Project:     {state.get('project_name', 'Unknown')}",
+        f"Phase:       {Colors.CYAN}{phase}{Colors.NC}",
+        f"Description: {phase_info.description}",
+        f"Entered:     {state['entered_at']}",
+        f"Next phase:  {phase_info.next}",
+        f"\n{Colors.BOLD}Required Artifacts:{Colors.NC}",
+    ]
+    for artifact in phase_info.required_artifacts:
+        lines.append(f"  - {artifact}")
+
+    lines.append(f"\n{Colors.BOLD}Allowed Actions:{Colors.NC}")
+    for action in phase_info.allowed_actions:
+        lines.append(f"  {Colors.GREEN}✓{Colors.NC} {action}")
 
-    print(f"\n{Colors.BOLD}Required Artifacts:{Colors.NC}")
-    for artifact in phase_info['required_artifacts']:
-        print(f"  - {artifact}")
+    lines.append(f"\n{Colors.BOLD}Forbidden Actions:{Colors.NC}")
+    for action in phase_info.forbidden_actions:
+        lines.append(f"  {Colors.RED}✗{Colors.NC} {action}")
 
-    print(f"\n{Colors.BOLD}Allowed Actions:{Colors.NC}")
-    for action in phase_info['allowed_actions']:
-        print(f"  {Colors.GREEN}✓{Colors.NC} {action}")
+    if phase_info.gate:
+        lines.append(f"\n{Colors.BOLD}Exit Gate:{Colors.NC} {phase_info.gate}")
+        lines.append(f"  Checklist: config/gates/{phase}-gate.md")
 
-    print(f"\n{Colors.BOLD}Forbidden Actions:{Colors.NC}")
-    for action in phase_info['forbidden_actions']:
-        print(f"  {Colors.RED}✗{Colors.NC} {action}")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-    if phase_info['gate']:
-        print(f"\n{Colors.BOLD}Exit Gate:{Colors.NC} {phase_info['gate']}")
-        print(f"  Checklist: config/gates/{phase}-gate.md")
+
+def count_checkboxes(content) -> Tuple[int, int]:
+    """Count checked and unchecked checklist items in a bytes-like buffer."""
+    counts = Counter(CHECKBOX_RE.findall(content))
+    checked = counts[b'x'] + counts[b'X']
+    unchecked = counts[b' ']
+    return checked, unchecked
 
 
 def check_gate(state: Dict) -> bool:
@@ -191,7 +340,7 @@ def check_gate(state: Dict) -> bool:
 
     phase = state["phase"]
     phase_info = PHASES[phase]
-    gate = phase_info.get("gate")
+    gate = phase_info.gate
 
     if not gate:
         print(f"{Colors.GREEN}✓{Colors.NC} No gate for {phase} phase")
@@ -207,13 +356,16 @@ def check_gate(state: Dict) -> bool:
         print(f"{Colors.YELLOW}!{Colors.NC} Gate checklist not found: {gate_file}")
         return False
 
-    # Parse checklist and check items
-    with open(gate_file, 'r') as f:
-        content = f.read()
+    import mmap
 
     # Count checked vs unchecked items
-    checked = content.count('[x]') + content.count('[X]')
-    unchecked = content.count('[ ]')
+    with open(gate_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            checked, unchecked = count_checkboxes(f.read())
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                checked, unchecked = count_checkboxes(mm)
+
     total = checked + unchecked
 
     if total == 0:
@@ -252,7 +404,7 @@ def set_phase(state: Dict, new_phase: str, force: bool = False) -> None:
         return
 
     # Check if this is a valid transition
-    expected_next = PHASES[current_phase]["next"]
+    expected_next = PHASES[current_phase].next
 
     if new_phase != expected_next and not force:
         print(f"{Colors.YELLOW}WARNING:{Colors.NC} Unexpected transition")
@@ -270,21 +422,24 @@ def set_phase(state: Dict, new_phase: str, force: bool = False) -> None:
             print(f"Use --force to override (not recommended)")
             return
 
-    # Perform transition
+    # Perform transition; the state and its history entry share one timestamp
+    now = datetime.now().isoformat()
     state["phase"] = new_phase
-    state["entered_at"] = datetime.now().isoformat()
-    state["history"].append({
+    state["entered_at"] = now
+    pending = append_history(state, {
         "phase": new_phase,
-        "entered_at": datetime.now().isoformat(),
+        "entered_at": now,
         "from_phase": current_phase,
         "action": "transitioned" if not force else "forced_transition"
     })
 
+    # Log the transition only once the state it belongs to has been saved
     save_state(state)
+    write_history_log(pending)
 
     print(f"\n{Colors.GREEN}✓{Colors.NC} Transitioned to {Colors.CYAN}{new_phase}{Colors.NC}")
     print(f"  From: {current_phase}")
-    print(f"  Description: {PHASES[new_phase]['description']}")
+    print(f"  Description: {PHASES[new_phase].description}")
 
 
 def show_history(state: Dict) -> None:
@@ -293,10 +448,12 @@ def show_history(state: Dict) -> None:
         print(f"{Colors.YELLOW}Project tracking not initialized.{Colors.NC}")
         return
 
-    print(f"\n{Colors.BOLD}Phase Transition History{Colors.NC}")
-    print("=" * 50)
+    lines = [
+        f"\n{Colors.BOLD}Phase Transition History{Colors.NC}",
+        "=" * 50,
+    ]
 
-    for i, entry in enumerate(state.get("history", [])):
+    for i, entry in enumerate(iter_history(state)):
         phase = entry["phase"]
         timestamp = entry["entered_at"]
         action = entry.get("action", "unknown")
@@ -305,14 +462,22 @@ def show_history(state: Dict) -> None:
         marker = "→" if i > 0 else "◆"
         from_str = f" (from {from_phase})" if from_phase else ""
 
-        print(f"{marker} {Colors.CYAN}{phase}{Colors.NC}{from_str}")
-        print(f"  {timestamp} - {action}")
+        lines.append(f"{marker} {Colors.CYAN}{phase}{Colors.NC}{from_str}")
+        lines.append(f"  {timestamp} - {action}")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():
+    global STATE_FORMAT
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Track SDLC phases for AI Coding Factory'
     )
+    parser.add_argument('--state-format', choices=STATE_FORMATS,
+                        help='State file format (default: $FACTORY_STATE_FORMAT or json)')
 
     subparsers = parser.add_subparsers(dest='command', help='Commands')
 
@@ -342,6 +507,17 @@ def main():
     if not args.command:
         args.command = 'status'
 
+    if args.state_format:
+        STATE_FORMAT = args.state_format
+    elif STATE_FORMAT not in STATE_FORMATS:
+        print(f"{Colors.RED}ERROR:{Colors.NC} Invalid FACTORY_STATE_FORMAT: {STATE_FORMAT}")
+        print(f"Valid formats: {', '.join(STATE_FORMATS)}")
+        sys.exit(1)
+
+    # Fail before any state or history file is touched
+    if STATE_FORMAT == "msgpack":
+        import_msgpack()
+
     # Load state
     state = load_state()
 
@@ -14,20 +14,15 @@ Options:
     --check-only     Only check, don't block
 """
 
-import argparse
+import fnmatch
+import functools
 import os
+import pickle
 import re
-import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-try:
-    import yaml
-except ImportError:
-    print("ERROR: PyYAML not installed. Run: pip install pyyaml")
-    sys.exit(1)
-
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -39,18 +34,157 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Below this many bytes, process pool startup outweighs parallel scanning.
+# Serial scanning runs at ~90MB/s and pool startup costs 20-60ms, so four
+# workers only break even at roughly 2-7MB of changed files.
+PARALLEL_SCAN_MIN_BYTES = 4 * 1024 * 1024
+# A pool also needs enough files to spread across its workers
+PARALLEL_SCAN_MIN_FILES = 8
+
+# Parsed rules are cached here, keyed by the rules file's path, mtime and size
+RULES_CACHE_FILE = Path('.factory') / 'cache' / 'enforcement-rules.pickle'
+
+
+STORY_ID_RE = re.compile(r'ACF-\d+')
+
+# (pattern, description) pairs checked against raw file bytes. Flags are
+# scoped per pattern so the same expressions compile for Hyperscan. Bytes
+# \w is ASCII-only, so \x80-\xff admits UTF-8 encoded word characters.
+SECRET_PATTERNS = [
+    (rb'(?i:(api[_-]?key|apikey)\s*[=:]\s*["\']?[\w\x80-\xff-]{20,})', 'Potential API key'),
+    (rb'(?i:(password|passwd|pwd)\s*[=:]\s*["\'][^"\']+["\'])', 'Hardcoded password'),
+    (rb'(?i:(secret|token)\s*[=:]\s*["\']?[\w\x80-\xff-]{20,})', 'Potential secret/token'),
+    (rb'(?i:(aws_access_key_id|aws_secret)\s*[=:])', 'AWS credentials'),
+    (rb'-----BEGIN (RSA |EC |DSA )?PRIVATE KEY-----', 'Private key'),
+    (rb'(?i:bearer\s+[\w\x80-\xff-]{20,})', 'Bearer token'),
+]
+
+# Compiled for the pure-Python fallback. Searching each pattern separately
+# beats one fused alternation with re: the backtracking engine tries every
+# alternative at every position and loses each pattern's prefix scan.
+SECRET_REGEXES = [
+    (re.compile(pattern), description) for pattern, description in SECRET_PATTERNS
+]
+
+
+# Namespaces the Domain layer must not depend on
+FORBIDDEN_NAMESPACES = [
+    'Infrastructure',
+    'Application',
+    'Microsoft.EntityFrameworkCore',
+    'System.Net.Http',
+    'Npgsql',
+]
+
+# A using directive importing a forbidden namespace, either directly or
+# under a project prefix (e.g. "using MyApp.Infrastructure.Data;"). The
+# first line may start with a UTF-8 byte order mark.
+FORBIDDEN_USING_RE = re.compile(
+    rb'^(?:\xef\xbb\xbf)?\s*(?:global\s+)?using\s+(?:static\s+)?(?:\w+\s*=\s*)?(?:[\w.]+\.)?('
+    + b'|'.join(re.escape(ns.encode()) for ns in FORBIDDEN_NAMESPACES)
+    + rb')\b',
+    re.MULTILINE
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_secrets_database():
+    """
+    Compile SECRET_PATTERNS into a Hyperscan database on first use.
+
+    Hyperscan is optional; returns None when it is unavailable, in which
+    case secrets are scanned with SECRET_REGEXES.
+    """
+    try:
+        import hyperscan
+    except ImportError:
+        return None
+
+    count = len(SECRET_PATTERNS)
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern for pattern, _ in SECRET_PATTERNS],
+            ids=list(range(count)),
+            elements=count,
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * count,
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+def get_rules_cache_key(rules_path: str) -> Tuple[str, int, int]:
+    """Build the cache key identifying a version of the rules file."""
+    stat = os.stat(rules_path)
+    return os.path.abspath(rules_path), stat.st_mtime_ns, stat.st_size
+
+
+def load_cached_rules(rules_path: str) -> Optional[Dict]:
+    """Load parsed rules from the cache if it matches the rules file."""
+    try:
+        with open(RULES_CACHE_FILE, 'rb') as f:
+            cache_key, rules_config = pickle.load(f)
+    except Exception:
+        # Missing, stale-format or corrupt cache: fall back to parsing
+        return None
+
+    if cache_key != get_rules_cache_key(rules_path):
+        return None
+    return rules_config
+
+
+def save_cached_rules(rules_path: str, rules_config: Dict) -> None:
+    """Cache parsed rules; failures only cost a re-parse next run."""
+    import pickletools
+
+    payload = pickle.dumps(
+        (get_rules_cache_key(rules_path), rules_config),
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+    try:
+        RULES_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        RULES_CACHE_FILE.write_bytes(pickletools.optimize(payload))
+    except OSError:
+        pass
+
+
+def parse_rules_yaml(content: bytes) -> Dict:
+    """Parse the rules YAML document."""
+    try:
+        import yaml
+    except ImportError:
+        print("ERROR: PyYAML not installed. Run: pip install pyyaml")
+        sys.exit(1)
+
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(content, Loader=loader)
+
+
 def load_rules(rules_path: str) -> Dict:
     """Load enforcement rules from YAML file."""
     if not os.path.exists(rules_path):
         print(f"{Colors.RED}ERROR:{Colors.NC} Rules file not found: {rules_path}")
         sys.exit(1)
 
-    with open(rules_path, 'r') as f:
-        return yaml.safe_load(f)
+    rules_config = load_cached_rules(rules_path)
+    if rules_config is None:
+        rules_config = parse_rules_yaml(Path(rules_path).read_bytes())
+        save_cached_rules(rules_path, rules_config)
+
+    # Compile each rule's path globs once instead of per file
+    for rule in rules_config.get('rules', []):
+        if rule.get('paths'):
+            rule['_compiled_paths'] = compile_path_patterns(rule['paths'])
+
+    return rules_config
 
 
 def get_git_staged_files() -> List[str]:
     """Get list of staged files."""
+    import subprocess
+
     try:
         result = subprocess.run(
             ['git', 'diff', '--cached', '--name-only'],
@@ -63,6 +197,8 @@ def get_git_staged_files() -> List[str]:
 
 def get_git_modified_files() -> List[str]:
     """Get list of modified files (staged + unstaged)."""
+    import subprocess
+
     try:
         result = subprocess.run(
             ['git', 'diff', '--name-only', 'HEAD'],
@@ -75,6 +211,8 @@ def get_git_modified_files() -> List[str]:
 
 def get_last_commit_message() -> str:
     """Get the last commit message."""
+    import subprocess
+
     try:
         result = subprocess.run(
             ['git', 'log', '-1', '--format=%s'],
@@ -85,57 +223,175 @@ def get_last_commit_message() -> str:
         return ""
 
 
+def get_git_context() -> Dict:
+    """
+    Collect modified files, staged files and the last commit message.
+
+    The git commands are independent, so they run concurrently to overlap
+    their process startup cost.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        modified_files = executor.submit(get_git_modified_files)
+        staged_files = executor.submit(get_git_staged_files)
+        commit_message = executor.submit(get_last_commit_message)
+
+        return {
+            'modified_files': modified_files.result(),
+            'staged_files': staged_files.result(),
+            'commit_message': commit_message.result(),
+        }
+
+
 def check_story_id_in_message(message: str) -> bool:
     """Check if commit message contains story ID (ACF-###)."""
-    return bool(re.search(r'ACF-\d+', message))
+    return bool(STORY_ID_RE.search(message))
 
 
-def check_file_matches_patterns(filepath: str, patterns: List[str]) -> bool:
-    """Check if filepath matches any of the glob patterns."""
-    from fnmatch import fnmatch
-    for pattern in patterns:
-        if fnmatch(filepath, pattern):
-            return True
-    return False
+def compile_path_patterns(patterns: List[str]) -> re.Pattern:
+    """Combine glob patterns into a single regex with fnmatch semantics."""
+    return re.compile('|'.join(
+        f'(?:{fnmatch.translate(os.path.normcase(pattern))})' for pattern in patterns
+    ))
 
 
-def check_for_potential_secrets(content: str) -> List[str]:
+def check_for_potential_secrets(content: bytes) -> List[str]:
     """Check content for potential secrets."""
-    secret_patterns = [
-        (r'(?i)(api[_-]?key|apikey)\s*[=:]\s*["\']?[\w-]{20,}', 'Potential API key'),
-        (r'(?i)(password|passwd|pwd)\s*[=:]\s*["\'][^"\']+["\']', 'Hardcoded password'),
-        (r'(?i)(secret|token)\s*[=:]\s*["\']?[\w-]{20,}', 'Potential secret/token'),
-        (r'(?i)(aws_access_key_id|aws_secret)\s*[=:]', 'AWS credentials'),
-        (r'-----BEGIN (RSA |EC |DSA )?PRIVATE KEY-----', 'Private key'),
-        (r'(?i)bearer\s+[\w-]{20,}', 'Bearer token'),
-    ]
-
-    findings = []
-    for pattern, description in secret_patterns:
-        if re.search(pattern, content):
-            findings.append(description)
-    return findings
-
-
-def check_domain_dependencies(filepath: str, content: str) -> List[str]:
+    database = get_secrets_database()
+    if database is not None:
+        found = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            found.add(pattern_id)
+
+        database.scan(content, match_event_handler=on_match)
+        return [SECRET_PATTERNS[i][1] for i in sorted(found)]
+
+    return [description for pattern, description in SECRET_REGEXES
+            if pattern.search(content)]
+
+
+def check_domain_dependencies(filepath: str, content: bytes) -> List[str]:
     """Check if Domain layer has forbidden dependencies."""
     if '/Domain/' not in filepath:
         return []
 
-    violations = []
-    forbidden_namespaces = [
-        'Infrastructure',
-        'Application',
-        'Microsoft.EntityFrameworkCore',
-        'System.Net.Http',
-        'Npgsql',
-    ]
+    found = {match.group(1).decode() for match in FORBIDDEN_USING_RE.finditer(content)}
+    return [f"Domain references forbidden namespace: {ns}"
+            for ns in FORBIDDEN_NAMESPACES if ns in found]
+
+
+def read_file(filepath: str) -> bytes:
+    """Read a file's raw bytes for scanning; the patterns are bytes too."""
+    return Path(filepath).read_bytes()
 
-    for ns in forbidden_namespaces:
-        if f'using {ns}' in content or f'using.*{ns}' in content:
-            violations.append(f"Domain references forbidden namespace: {ns}")
 
-    return violations
+def get_existing_files(context: Dict) -> set:
+    """Return the modified files that exist on disk, checked once per run."""
+    existing = context.get('_existing')
+    if existing is None:
+        existing = {f for f in context.get('modified_files', []) if os.path.exists(f)}
+        context['_existing'] = existing
+    return existing
+
+
+def get_file_content(context: Dict, filepath: str) -> bytes:
+    """Read a file once per run, caching its content in the context."""
+    file_cache = context.setdefault('_file_cache', {})
+    content = file_cache.get(filepath)
+    if content is None:
+        content = read_file(filepath)
+        file_cache[filepath] = content
+    return content
+
+
+def scan_file_for_secrets(filepath: str) -> List[str]:
+    """Read and scan a single file for secrets (process pool worker)."""
+    return check_for_potential_secrets(read_file(filepath))
+
+
+def find_secrets(filepaths: List[str], context: Dict) -> Optional[Tuple[str, List[str]]]:
+    """
+    Scan files for potential secrets.
+
+    Large changesets are scanned in a process pool; small ones are scanned
+    serially using the per-run file cache.
+
+    Returns:
+        Tuple of (filepath, findings) for the first file with secrets, or None
+    """
+    cpu_count = os.cpu_count() or 1
+    if (cpu_count > 1 and len(filepaths) >= PARALLEL_SCAN_MIN_FILES
+            and sum(map(os.path.getsize, filepaths)) >= PARALLEL_SCAN_MIN_BYTES):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(len(filepaths), cpu_count)) as executor:
+            results = executor.map(scan_file_for_secrets, filepaths)
+            for filepath, secrets in zip(filepaths, results):
+                if secrets:
+                    return filepath, secrets
+        return None
+
+    for filepath in filepaths:
+        secrets = check_for_potential_secrets(get_file_content(context, filepath))
+        if secrets:
+            return filepath, secrets
+    return None
+
+
+def commit_message_has_story_id(context: Dict) -> bool:
+    """Check the commit message for a story ID, once per run."""
+    has_story_id = context.get('_has_story_id')
+    if has_story_id is None:
+        if 'commit_message' in context:
+            message = context['commit_message']
+        else:
+            message = get_last_commit_message()
+        has_story_id = check_story_id_in_message(message)
+        context['_has_story_id'] = has_story_id
+    return has_story_id
+
+
+def get_staged_set(context: Dict) -> set:
+    """Return the staged files as a set, built once per run."""
+    staged = context.get('_staged_set')
+    if staged is None:
+        if 'staged_files' in context:
+            staged = set(context['staged_files'])
+        else:
+            staged = set(get_git_staged_files())
+        context['_staged_set'] = staged
+    return staged
+
+
+def get_normalized_files(context: Dict) -> List[Tuple[str, str]]:
+    """Return (path, normcased path) pairs for the modified files, once per run."""
+    normalized = context.get('_normalized_files')
+    if normalized is None:
+        normalized = [(f, os.path.normcase(f)) for f in context.get('modified_files', [])]
+        context['_normalized_files'] = normalized
+    return normalized
+
+
+def get_matching_files(rule: Dict, context: Dict) -> List[str]:
+    """
+    Return the modified files matching a rule's path globs.
+
+    Results are memoized per run by glob set, so rules sharing the same
+    paths only match the modified files once.
+    """
+    paths = rule['paths']
+    memo = context.setdefault('_matching_files', {})
+    key = frozenset(paths)
+
+    matching_files = memo.get(key)
+    if matching_files is None:
+        compiled_paths = rule.get('_compiled_paths') or compile_path_patterns(paths)
+        matching_files = [f for f, normalized in get_normalized_files(context)
+                          if compiled_paths.match(normalized)]
+        memo[key] = matching_files
+    return matching_files
 
 
 def validate_rule(rule: Dict, context: Dict) -> Tuple[bool, str]:
@@ -158,42 +414,40 @@ def validate_rule(rule: Dict, context: Dict) -> Tuple[bool, str]:
         return True, "Skipped (wrong trigger)"
 
     # Check path patterns if specified
+    matching_files = None
     if paths:
-        modified_files = context.get('modified_files', [])
-        matching_files = [f for f in modified_files
-                         if check_file_matches_patterns(f, paths)]
+        matching_files = get_matching_files(rule, context)
         if not matching_files:
             return True, "Skipped (no matching files)"
-        context['matching_files'] = matching_files
 
     # Evaluate condition
     if condition == '!commit_message_has_story_id':
-        message = context.get('commit_message', get_last_commit_message())
-        if not check_story_id_in_message(message):
+        if not commit_message_has_story_id(context):
             return False, rule.get('message', 'Story ID missing')
 
     elif condition == 'contains_potential_secrets':
-        for filepath in context.get('matching_files', context.get('modified_files', [])):
-            if os.path.exists(filepath):
-                with open(filepath, 'r', errors='ignore') as f:
-                    content = f.read()
-                secrets = check_for_potential_secrets(content)
-                if secrets:
-                    return False, f"Potential secrets in {filepath}: {', '.join(secrets)}"
+        existing = get_existing_files(context)
+        if matching_files is None:
+            matching_files = context.get('modified_files', [])
+        filepaths = [f for f in matching_files if f in existing]
+        found = find_secrets(filepaths, context)
+        if found:
+            filepath, secrets = found
+            return False, f"Potential secrets in {filepath}: {', '.join(secrets)}"
 
     elif condition == 'domain_has_infrastructure_reference':
-        for filepath in context.get('matching_files', []):
-            if os.path.exists(filepath):
-                with open(filepath, 'r', errors='ignore') as f:
-                    content = f.read()
+        existing = get_existing_files(context)
+        for filepath in matching_files or []:
+            if filepath in existing:
+                content = get_file_content(context, filepath)
                 violations = check_domain_dependencies(filepath, content)
                 if violations:
                     return False, '\n'.join(violations)
 
     elif condition == 'file_staged':
         # For .env file blocking
-        staged = get_git_staged_files()
-        for filepath in context.get('matching_files', []):
+        staged = get_staged_set(context)
+        for filepath in matching_files or []:
             if filepath in staged:
                 return False, rule.get('message', f'File should not be staged: {filepath}')
 
@@ -220,6 +474,9 @@ def validate_all_rules(rules_config: Dict, context: Dict, verbose: bool = False)
 
     rules = rules_config.get('rules', [])
 
+    # Collect rule results and write them in one call
+    lines = []
+
     for rule in rules:
         rule_name = rule.get('name', 'unknown')
         action = rule.get('action', 'warn')
@@ -229,26 +486,29 @@ def validate_all_rules(rules_config: Dict, context: Dict, verbose: bool = False)
         if is_valid:
             passed += 1
             if verbose:
-                print(f"{Colors.GREEN}✓{Colors.NC} {rule_name}: {message}")
+                lines.append(f"{Colors.GREEN}✓{Colors.NC} {rule_name}: {message}")
         else:
             if action == 'block':
                 errors += 1
-                print(f"{Colors.RED}✗{Colors.NC} {rule_name}: BLOCKED")
-                print(f"  {message}")
+                lines.append(f"{Colors.RED}✗{Colors.NC} {rule_name}: BLOCKED")
+                lines.append(f"  {message}")
             elif action == 'warn':
                 warnings += 1
-                print(f"{Colors.YELLOW}!{Colors.NC} {rule_name}: WARNING")
-                print(f"  {message}")
+                lines.append(f"{Colors.YELLOW}!{Colors.NC} {rule_name}: WARNING")
+                lines.append(f"  {message}")
             elif action == 'require_review':
                 warnings += 1
                 agent = rule.get('agent', 'code-reviewer')
-                print(f"{Colors.BLUE}→{Colors.NC} {rule_name}: Review Required")
-                print(f"  Agent: {agent}")
-                print(f"  {message}")
+                lines.append(f"{Colors.BLUE}→{Colors.NC} {rule_name}: Review Required")
+                lines.append(f"  Agent: {agent}")
+                lines.append(f"  {message}")
             elif action == 'require_approval':
                 warnings += 1
-                print(f"{Colors.YELLOW}⚡{Colors.NC} {rule_name}: Approval Required")
-                print(f"  {message}")
+                lines.append(f"{Colors.YELLOW}⚡{Colors.NC} {rule_name}: Approval Required")
+                lines.append(f"  {message}")
+
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     return passed, warnings, errors
 
@@ -291,6 +551,8 @@ def print_cross_cutting_info(rules_config: Dict):
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Validate enforcement rules for AI Coding Factory'
     )
@@ -352,9 +614,8 @@ def main():
     context = {
         'phase': args.phase,
         'trigger': args.trigger,
-        'modified_files': get_git_modified_files(),
-        'staged_files': get_git_staged_files(),
-        'commit_message': get_last_commit_message(),
+        **get_git_context(),
+        '_file_cache': {},
     }
 
     if args.verbose: